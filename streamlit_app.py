@@ -11,16 +11,23 @@ st.title("📅 Personalized Timetable Generator")
 @st.cache_data
 
 def load_course_data():
-    df = pd.read_excel("Course and Sections.xlsx", sheet_name="Table 2")
-    course_map = {}
-    for _, row in df.iterrows():
-        abbrev = row["Abbriviation"]
-        area = row["Area"]
-        full_name = row["Course Name"]
-        sections = [s.strip() for s in row["Sections"].split(",")]
-        for sec in sections:
-            course_map[(abbrev, sec)] = {"area": area, "course_name": full_name}
-    return df, course_map
+    df = pd.read_excel(
+        "Course and Sections.xlsx",
+        sheet_name="Table 2",
+        engine="calamine",
+        usecols=["Area", "Abbriviation", "Course Name", "Sections"],
+    )
+    # Sidebar options per course, built once per load
+    df["Section Options"] = df["Sections"].fillna("").astype(str).str.split(",").map(
+        lambda secs: tuple(dict.fromkeys(sec.strip() for sec in secs if sec.strip()))
+    )
+    pairs = df.explode("Section Options").rename(columns={"Section Options": "Section"})
+    course_info = (
+        pairs.rename(columns={"Course Name": "course_name", "Area": "area"})
+        .drop_duplicates(["Abbriviation", "Section"], keep="last")
+        .set_index(["Abbriviation", "Section"])[["course_name", "area"]]
+    )
+    return df, course_info
 
 course_df, course_info = load_course_data()
 
@@ -28,55 +35,49 @@ course_df, course_info = load_course_data()
 st.sidebar.header("Step 1: Select Your Courses")
 user_selection = []
 
-for area in sorted(course_df["Area"].unique()):
+for area, area_df in course_df.groupby("Area", sort=True):
     with st.sidebar.expander(f"📚 {area}"):
-        area_df = course_df[course_df["Area"] == area]
         for _, row in area_df.iterrows():
             course = row["Abbriviation"]
             label = row["Course Name"]
-            sections = row["Sections"].split(",")
+            sections = row["Section Options"]
             selected = st.multiselect(f"{label} ({course})", sections, key=f"{course}_{area}")
             for sec in selected:
-                user_selection.append((course, sec.strip()))
+                user_selection.append((course, sec))
 
 # UI: PDF Upload
 st.sidebar.header("Step 2: Upload Weekly Timetable PDF")
 pdf_file = st.sidebar.file_uploader("Upload PDF", type=["pdf"])
 
 # Regex parser
+SESSION_PATTERN = re.compile(r"(\b[A-Z]{2,5})-([A-Z])\(\d+\)-([A-Z]+)\s*\{([^}]+)\}")
+SESSION_COLUMNS = ["course_abbr", "section", "faculty", "venue"]
+
 def parse_pdf(pdf_bytes):
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    text = "\n".join(page.get_text() for page in doc)
-    pattern = re.compile(r"(\b[A-Z]{2,5})-([A-Z])\(\d+\)-([A-Z]+)\s*\{([^}]+)\}")
-    matches = pattern.findall(text)
-    sessions = [
-        {"course_abbr": m[0], "section": m[1], "faculty": m[2], "venue": m[3]}
-        for m in matches
-    ]
-    return sessions
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        for page in doc:
+            text = page.get_text()
+            # Sessions end in "{venue}"; skip pages without a brace
+            if "{" not in text:
+                continue
+            for m in SESSION_PATTERN.finditer(text):
+                yield m.groups()
 
-# Filter by selection
-def filter_schedule(sessions, selected, info_map):
-    schedule = []
-    for s in sessions:
-        key = (s["course_abbr"], s["section"])
-        if key in selected:
-            enriched = {
-                **s,
-                "course_name": info_map[key]["course_name"],
-                "area": info_map[key]["area"]
-            }
-            schedule.append(enriched)
-    return schedule
+# Parsed sessions, cached per uploaded file
+@st.cache_data(show_spinner=False)
+def load_sessions(pdf_bytes):
+    return list(parse_pdf(pdf_bytes))
 
 # Show results
 if pdf_file and user_selection:
-    sessions = parse_pdf(pdf_file.read())
-    final_schedule = filter_schedule(sessions, user_selection, course_info)
+    wanted = frozenset(user_selection)
+    final_schedule = [s for s in load_sessions(pdf_file.getvalue()) if s[:2] in wanted]
 
     if final_schedule:
         st.success("Here is your personalized schedule:")
-        df_output = pd.DataFrame(final_schedule)
+        df_output = pd.DataFrame(final_schedule, columns=SESSION_COLUMNS).join(
+            course_info, on=["course_abbr", "section"]
+        )
         df_output = df_output[["course_name", "section", "faculty", "venue", "area"]]
         df_output.columns = ["Course", "Section", "Faculty", "Venue", "Area"]
         st.dataframe(df_output, use_container_width=True)